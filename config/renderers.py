@@ -0,0 +1,28 @@
+"""
+Custom DRF renderers for SafeSight.
+"""
+import orjson
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(renderers.BaseRenderer):
+    """
+    JSON renderer backed by orjson.
+
+    Dicts, lists, datetimes, dates and NumPy values are serialized in C.
+    Types orjson does not know (Decimal, QuerySet, lazy strings, ...) fall
+    back to DRF's JSONEncoder.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    options = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY
+
+    _fallback_encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=self._fallback_encoder.default, option=self.options)
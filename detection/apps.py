@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class DetectionConfig(AppConfig):
     name = 'detection'
+
+    def ready(self):
+        from . import signals  # noqa: F401
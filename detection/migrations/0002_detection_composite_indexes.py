@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-15 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('detection', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='detectionrecord',
+            index=models.Index(fields=['session_id', '-timestamp'], name='detection_r_session_e4e66b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='violationrecord',
+            index=models.Index(fields=['worker_id', 'status', '-timestamp'], name='violation_r_worker__eea301_idx'),
+        ),
+    ]
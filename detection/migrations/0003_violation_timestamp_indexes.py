@@ -0,0 +1,25 @@
+# Generated by Django 6.0.2 on 2026-10-15 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('detection', '0002_detection_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='violationrecord',
+            index=models.Index(fields=['timestamp', 'worker_id'], name='violation_r_timesta_3918cf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='violationrecord',
+            index=models.Index(fields=['timestamp', 'status'], name='violation_r_timesta_49db25_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='violationrecord',
+            index=models.Index(fields=['timestamp', 'severity'], name='violation_r_timesta_f92240_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.2 on 2026-10-15 11:00
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_worker_department(apps, schema_editor):
+    """Copy each violation's worker department in a single UPDATE."""
+    ViolationRecord = apps.get_model('detection', 'ViolationRecord')
+    Worker = apps.get_model('workers', 'Worker')
+    ViolationRecord.objects.filter(worker_id__isnull=False).update(
+        worker_department=Subquery(
+            Worker.objects.filter(worker_id=OuterRef('worker_id')).values('department')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('detection', '0003_violation_timestamp_indexes'),
+        ('workers', '0003_worker_face_encoding_bin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='violationrecord',
+            name='worker_department',
+            field=models.CharField(blank=True, db_index=True, help_text="Copy of the worker's department for report filtering", max_length=50, null=True),
+        ),
+        migrations.RunPython(backfill_worker_department, migrations.RunPython.noop),
+    ]
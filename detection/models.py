@@ -42,6 +42,7 @@ class DetectionRecord(models.Model):
         indexes = [
             models.Index(fields=['-timestamp']),
             models.Index(fields=['session_id']),
+            models.Index(fields=['session_id', '-timestamp']),
         ]
 
     def __str__(self):
@@ -72,6 +73,13 @@ class ViolationRecord(models.Model):
     # Worker info
     worker_id = models.CharField(max_length=50, blank=True, null=True, db_index=True)
     worker_name = models.CharField(max_length=200, blank=True, null=True)
+    worker_department = models.CharField(
+        max_length=50,
+        blank=True,
+        null=True,
+        db_index=True,
+        help_text="Copy of the worker's department for report filtering"
+    )
 
     # Detection data
     missing_ppe = models.JSONField(default=list, help_text="List of missing PPE types")
@@ -111,8 +119,22 @@ class ViolationRecord(models.Model):
             models.Index(fields=['worker_id']),
             models.Index(fields=['status']),
             models.Index(fields=['severity']),
+            models.Index(fields=['worker_id', 'status', '-timestamp']),
+            models.Index(fields=['timestamp', 'worker_id']),
+            models.Index(fields=['timestamp', 'status']),
+            models.Index(fields=['timestamp', 'severity']),
         ]
 
+    def save(self, *args, **kwargs):
+        # Copy the worker's department on insert; later department changes
+        # are propagated by the Worker post_save handler
+        if self._state.adding and self.worker_id and self.worker_department is None:
+            from workers.models import Worker
+            self.worker_department = Worker.objects.filter(
+                worker_id=self.worker_id
+            ).values_list('department', flat=True).first()
+        super().save(*args, **kwargs)
+
     def __str__(self):
         worker = self.worker_name or self.worker_id or "Unknown"
         return f"Violation {self.violation_id} - {worker} - {self.timestamp.strftime('%Y-%m-%d %H:%M')}"
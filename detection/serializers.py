@@ -15,6 +15,16 @@ class DetectionRecordSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'timestamp']
 
 
+class DetectionRecordListSerializer(serializers.ModelSerializer):
+    """Serializer for DetectionRecord listings (without the full detections JSON)."""
+    class Meta:
+        model = DetectionRecord
+        fields = ['id', 'frame_id', 'timestamp', 'detected_count',
+                  'compliant_count', 'non_compliant_count',
+                  'image_path', 'session_id']
+        read_only_fields = ['id', 'timestamp']
+
+
 class ViolationRecordSerializer(serializers.ModelSerializer):
     """Serializer for ViolationRecord model."""
     image_url = serializers.SerializerMethodField()
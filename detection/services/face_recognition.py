@@ -187,6 +187,46 @@ class FaceRecognitionService:
             logger.error(f"Error recognizing face: {e}")
             return None
 
+    @classmethod
+    def recognize_faces(cls, face_encodings: List[np.ndarray]) -> List[Optional[str]]:
+        """
+        Recognize several faces with a single nearest-neighbour query.
+
+        Args:
+            face_encodings: List of 128-dimensional face encodings
+
+        Returns:
+            List of worker_ids (or None) aligned with the input order
+        """
+        if not face_encodings:
+            return []
+
+        if not cls._model_loaded:
+            cls.load_model()
+
+        if cls._knn_clf is None:
+            return [None] * len(face_encodings)
+
+        try:
+            distances, indices = cls._knn_clf.kneighbors(
+                np.stack(face_encodings),
+                n_neighbors=1
+            )
+
+            worker_ids = []
+            for distance, class_index in zip(distances[:, 0], indices[:, 0]):
+                class_index = int(class_index)
+                if distance < FACE_DISTANCE_THRESHOLD and class_index < len(cls._worker_id_map):
+                    worker_ids.append(cls._worker_id_map[class_index])
+                else:
+                    worker_ids.append(None)
+
+            return worker_ids
+
+        except Exception as e:
+            logger.error(f"Error recognizing faces: {e}")
+            return [None] * len(face_encodings)
+
     @classmethod
     def recognize_face_from_bbox(
         cls,
@@ -203,51 +243,85 @@ class FaceRecognitionService:
         Returns:
             worker_id if recognized, None otherwise
         """
-        try:
-            import io
+        return cls.recognize_faces_batch(image_bytes, [bbox])[0]
 
-            # Load image and get dimensions
-            image = Image.open(io.BytesIO(image_bytes))
-            img_width, img_height = image.size
+    @classmethod
+    def recognize_faces_batch(
+        cls,
+        image_bytes: bytes,
+        bboxes: List[Dict[str, float]]
+    ) -> List[Optional[str]]:
+        """
+        Recognize the faces of several people in one image.
 
-            # Convert normalized bbox to pixel coordinates
-            x1 = int(bbox['x'] * img_width)
-            y1 = int(bbox['y'] * img_height)
-            x2 = int((bbox['x'] + bbox['width']) * img_width)
-            y2 = int((bbox['y'] + bbox['height']) * img_height)
+        The image is decoded once, every face region is cropped from the
+        same array and all encodings are matched in one KNN query.
 
-            # Expand bbox to include head/face area
-            # Face is typically in upper portion of person bbox
-            head_height = int((y2 - y1) * 0.5)  # Top 50%
-            face_y1 = max(0, y1)
-            face_y2 = min(img_height, y1 + head_height)
+        Args:
+            image_bytes: Original image bytes
+            bboxes: Normalized person bounding boxes {x, y, width, height} (0-1)
 
-            # Add some padding
-            padding = int((x2 - x1) * 0.15)
-            face_x1 = max(0, x1 - padding)
-            face_x2 = min(img_width, x2 + padding)
+        Returns:
+            List of worker_ids (or None) aligned with the input bboxes
+        """
+        worker_ids = [None] * len(bboxes)
+        if not bboxes:
+            return worker_ids
 
-            # Crop face region
-            face_region = image.crop((face_x1, face_y1, face_x2, face_y2))
+        try:
+            import io
+
+            # Decode the image once for all crops
+            image = np.asarray(Image.open(io.BytesIO(image_bytes)).convert('RGB'))
+            img_height, img_width = image.shape[:2]
 
-            # Extract encoding directly from the PIL Image/numpy array
             try:
                 import face_recognition
-                # Convert PIL to numpy array (RGB format)
-                face_array = np.array(face_region)
+            except ImportError:
+                logger.debug("face_recognition library not installed, skipping recognition")
+                return worker_ids
+
+            encoded_indices = []
+            encodings = []
+
+            for i, bbox in enumerate(bboxes):
+                # Convert normalized bbox to pixel coordinates
+                x1 = int(bbox['x'] * img_width)
+                y1 = int(bbox['y'] * img_height)
+                x2 = int((bbox['x'] + bbox['width']) * img_width)
+                y2 = int((bbox['y'] + bbox['height']) * img_height)
+
+                # Face is typically in upper portion of person bbox
+                head_height = int((y2 - y1) * 0.5)  # Top 50%
+                face_y1 = max(0, y1)
+                face_y2 = min(img_height, y1 + head_height)
+
+                # Add some padding
+                padding = int((x2 - x1) * 0.15)
+                face_x1 = max(0, x1 - padding)
+                face_x2 = min(img_width, x2 + padding)
+
+                # Crop face region (dlib needs a contiguous array)
+                face_array = np.ascontiguousarray(image[face_y1:face_y2, face_x1:face_x2])
+                if face_array.size == 0:
+                    continue
+
+                try:
+                    face_encodings = face_recognition.face_encodings(face_array)
+                    if len(face_encodings) > 0:
+                        encoded_indices.append(i)
+                        encodings.append(face_encodings[0])
+                except Exception as e:
+                    logger.debug(f"Face encoding failed from bbox: {e}")
 
-                # face_recognition needs RGB format, PIL gives RGB
-                encodings = face_recognition.face_encodings(face_array)
-                if len(encodings) > 0:
-                    return cls.recognize_face(encodings[0])
-            except Exception as e:
-                logger.debug(f"Face encoding failed from bbox: {e}")
+            for i, worker_id in zip(encoded_indices, cls.recognize_faces(encodings)):
+                worker_ids[i] = worker_id
 
-            return None
+            return worker_ids
 
         except Exception as e:
-            logger.error(f"Error recognizing face from bbox: {e}")
-            return None
+            logger.error(f"Error recognizing faces from bboxes: {e}")
+            return worker_ids
 
     @classmethod
     def add_worker_to_model(cls, worker_id: str, face_encoding: np.ndarray) -> bool:
@@ -272,16 +346,20 @@ class FaceRecognitionService:
             X_list = []
             y_list = []
 
-            # Add existing workers
+            # Add existing workers (fetched in one query)
+            from workers.models import Worker
+            existing_workers = Worker.objects.filter(
+                worker_id__in=cls._worker_id_map
+            ).only('worker_id', 'face_encoding_bin').in_bulk(field_name='worker_id')
+
             for existing_worker_id in cls._worker_id_map:
-                try:
-                    from workers.models import Worker
-                    worker = Worker.objects.get(worker_id=existing_worker_id)
-                    if worker.face_encoding:
-                        X_list.append(np.array(worker.face_encoding))
-                        y_list.append(len(X_list) - 1)  # Index in X_list
-                except Worker.DoesNotExist:
+                worker = existing_workers.get(existing_worker_id)
+                if worker is None:
                     continue
+                encoding = worker.face_encoding_array
+                if encoding is not None:
+                    X_list.append(encoding)
+                    y_list.append(len(X_list) - 1)  # Index in X_list
 
             # Add new worker
             X_list.append(face_encoding)
@@ -11,7 +11,7 @@ from datetime import datetime
 from typing import List, Dict, Tuple, Optional, Any
 from dataclasses import dataclass, asdict
 
-from PIL import Image
+import cv2
 import numpy as np
 from django.conf import settings
 
@@ -36,7 +36,7 @@ FLUTTER_TO_MODEL_MAP = {
 }
 
 # PPE types that Flutter app expects but are not in the model
-MISSING_PPE_TYPES = ['safetyGlasses', 'earProtection']
+MISSING_PPE_TYPES = frozenset({'safetyGlasses', 'earProtection'})
 
 
 @dataclass
@@ -88,24 +88,17 @@ class DetectionResult:
 
 class PPEModelService:
     """
-    Singleton service for PPE detection using YOLOv11.
+    Service for PPE detection using YOLOv11.
 
     The model is loaded once at server startup and reused for all detections.
+    All methods are classmethods; the class is not meant to be instantiated.
     """
 
-    _instance = None
     _model = None
     _model_loaded = False
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(PPEModelService, cls).__new__(cls)
-        return cls._instance
-
-    def __init__(self):
-        """Initialize the model service (load model if not already loaded)."""
-        if not self._model_loaded:
-            self.load_model()
+    def __new__(cls, *args, **kwargs):
+        raise TypeError("PPEModelService is not instantiable, use its classmethods directly")
 
     @classmethod
     def load_model(cls) -> None:
@@ -136,6 +129,20 @@ class PPEModelService:
             logger.error(f"Failed to load PPE model: {e}")
             raise
 
+        cls._warm_up()
+
+    @classmethod
+    def _warm_up(cls) -> None:
+        """
+        Run a dummy inference so the first real request does not pay for
+        backend initialization (CUDA context, kernel selection, allocator).
+        """
+        try:
+            cls._model(np.zeros((640, 640, 3), dtype=np.uint8), verbose=False)
+            logger.info("PPE detection model warmed up")
+        except Exception as e:
+            logger.warning(f"PPE model warm-up failed: {e}")
+
     @classmethod
     def predict(
         cls,
@@ -217,21 +224,36 @@ class PPEModelService:
         # Find all person detections first
         person_indices = [i for i, cls in enumerate(boxes.cls) if int(cls) == 2]
 
+        # Nothing to associate PPE with (e.g. an idle camera frame)
+        if not person_indices:
+            return DetectionResult(
+                frameId=frame_id,
+                detected=0,
+                compliant=0,
+                nonCompliant=0,
+                detections=[]
+            )
+
+        # Normalize all person bounding boxes to 0-1 in one operation
+        persons_xyxy = boxes.xyxy[person_indices].cpu().numpy()
+        norm = persons_xyxy / np.array([img_width, img_height, img_width, img_height])
+        widths = norm[:, 2] - norm[:, 0]
+        heights = norm[:, 3] - norm[:, 1]
+
         person_detections = []
         compliant_count = 0
         non_compliant_count = 0
+        now_iso = datetime.utcnow().isoformat() + 'Z'
 
-        for person_idx in person_indices:
-            person_box = boxes.xyxy[person_idx].cpu().numpy()
+        for i, person_idx in enumerate(person_indices):
+            person_box = persons_xyxy[i]
             person_conf = float(boxes.conf[person_idx])
 
-            # Get person bounding box (normalized to 0-1)
-            x1, y1, x2, y2 = person_box
             bbox = BoundingBox(
-                x=float(x1 / img_width),
-                y=float(y1 / img_height),
-                width=float((x2 - x1) / img_width),
-                height=float((y2 - y1) / img_height)
+                x=float(norm[i, 0]),
+                y=float(norm[i, 1]),
+                width=float(widths[i]),
+                height=float(heights[i])
             )
 
             # Find PPE items associated with this person (within person box)
@@ -240,7 +262,8 @@ class PPEModelService:
             # Calculate compliance
             ppe_status_list = cls._calculate_ppe_status(
                 detected_ppe,
-                required_ppe
+                required_ppe,
+                now_iso
             )
 
             # Determine overall status
@@ -251,17 +274,9 @@ class PPEModelService:
             else:
                 non_compliant_count += 1
 
-            # Recognize worker from face (if image bytes provided)
-            worker_id = None
-            if image_bytes is not None:
-                worker_id = FaceRecognitionService.recognize_face_from_bbox(
-                    image_bytes,
-                    asdict(bbox)
-                )
-
             # Create person detection
             person_detection = PersonDetection(
-                workerId=worker_id,  # Populated by face recognition if available
+                workerId=None,  # Populated by face recognition below if available
                 boundingBox=asdict(bbox),
                 ppeStatus=ppe_status_list,
                 overallStatus=overall_status,
@@ -270,6 +285,15 @@ class PPEModelService:
 
             person_detections.append(asdict(person_detection))
 
+        # Recognize all workers from their faces in one batch (if image bytes provided)
+        if image_bytes is not None and person_detections:
+            worker_ids = FaceRecognitionService.recognize_faces_batch(
+                image_bytes,
+                [detection['boundingBox'] for detection in person_detections]
+            )
+            for detection, worker_id in zip(person_detections, worker_ids):
+                detection['workerId'] = worker_id
+
         return DetectionResult(
             frameId=frame_id,
             detected=len(person_detections),
@@ -299,6 +323,11 @@ class PPEModelService:
             Dictionary mapping PPE type to (confidence, area)
         """
         detected_ppe = {}
+
+        # Only the person itself was detected, no PPE boxes to check
+        if len(boxes.cls) == 1:
+            return detected_ppe
+
         px1, py1, px2, py2 = person_box
         person_area = (px2 - px1) * (py2 - py1)
 
@@ -339,7 +368,8 @@ class PPEModelService:
     def _calculate_ppe_status(
         cls,
         detected_ppe: Dict[str, Tuple[float, float]],
-        required_ppe: List[str]
+        required_ppe: List[str],
+        now_iso: str
     ) -> List[Dict[str, Any]]:
         """
         Calculate status for each PPE type.
@@ -347,12 +377,12 @@ class PPEModelService:
         Args:
             detected_ppe: Dictionary of detected PPE with confidence
             required_ppe: List of required PPE types
+            now_iso: ISO8601 timestamp of the frame, used as lastDetected
 
         Returns:
             List of PPE status dictionaries
         """
         ppe_status_list = []
-        now = datetime.utcnow().isoformat() + 'Z'
 
         for ppe_type in required_ppe:
             # Check if PPE type is supported by model
@@ -369,7 +399,7 @@ class PPEModelService:
                 ppe_status_list.append({
                     'type': ppe_type,
                     'status': 'compliant',
-                    'lastDetected': now
+                    'lastDetected': now_iso
                 })
             else:
                 ppe_status_list.append({
@@ -423,10 +453,10 @@ class PPEModelService:
             DetectionResult object
         """
         try:
-            # Load image from bytes
-            import io
-            image = Image.open(io.BytesIO(image_bytes))
-            image = image.convert('RGB')
+            # Decode image bytes straight into an ndarray (BGR, as YOLO expects)
+            image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if image is None:
+                raise ValueError("Could not decode image bytes")
 
             # Pass image_bytes for face recognition
             return cls.predict(image, conf_threshold, required_ppe, image_bytes=image_bytes)
@@ -0,0 +1,24 @@
+"""
+Signal handlers for the Detection app.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from reports.cache import bump_report_data_version
+from workers.models import Worker
+from .models import ViolationRecord
+
+
+@receiver(post_save, sender=Worker)
+def sync_violation_worker_department(sender, instance, **kwargs):
+    """Keep ViolationRecord.worker_department in sync with the worker's department."""
+    ViolationRecord.objects.filter(
+        worker_id=instance.worker_id
+    ).exclude(
+        worker_department=instance.department
+    ).update(worker_department=instance.department)
+
+    # update() sends no signals, and worker reports also read the worker's
+    # own name/department, so invalidate cached reports explicitly
+    transaction.on_commit(bump_report_data_version)
@@ -1,3 +1,113 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from authentication.models import User
+from .models import DetectionRecord, ViolationRecord
+from .services.ppe_model import DetectionResult
+
+
+def _png_upload(name='frame.png'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (8, 8)).save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+class UploadAndDetectTests(TestCase):
+    """Upload responses describe records that are already saved."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        result = DetectionResult(
+            frameId='frame-1',
+            detected=1,
+            compliant=0,
+            nonCompliant=1,
+            detections=[{
+                'workerId': None,
+                'boundingBox': {'x': 0.1, 'y': 0.1, 'width': 0.2, 'height': 0.5},
+                'ppeStatus': [
+                    {'type': 'hardHat', 'status': 'nonCompliant', 'lastDetected': None},
+                    {'type': 'vest', 'status': 'compliant', 'lastDetected': None},
+                ],
+                'overallStatus': 'nonCompliant',
+                'confidence': 0.9,
+            }]
+        )
+        patcher = mock.patch(
+            'detection.views.PPEModelService.predict_from_bytes', return_value=result
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_response_matches_saved_records(self):
+        response = APIClient().post(
+            '/api/detection/upload/', {'image': _png_upload()}, format='multipart'
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+
+        record = DetectionRecord.objects.get(frame_id='frame-1')
+        self.assertEqual(data['record_id'], record.id)
+
+        self.assertEqual(len(data['violations']), 1)
+        violation = data['violations'][0]
+        saved = ViolationRecord.objects.get(violation_id=violation['violation_id'])
+        self.assertEqual(violation['id'], saved.id)
+        self.assertEqual(violation['worker_name'], 'Unknown Worker')
+        self.assertEqual(violation['missing_ppe'], ['hardHat'])
+        self.assertEqual(violation['severity'], 'critical')
+        self.assertIsNotNone(violation['timestamp'])
+        self.assertTrue(violation['image_url'].startswith('http://testserver/'))
+
+
+class RecordPaginationTests(TestCase):
+    """Record listings page without clamping and reject invalid pages."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='viewer', password='secret')
+        DetectionRecord.objects.bulk_create(
+            DetectionRecord(frame_id=f'frame-{i}', detections=[]) for i in range(5)
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_page(self, query):
+        return self.client.get(f'/api/detection/records/?{query}')
+
+    def test_last_page(self):
+        data = self.get_page('page=3&page_size=2').json()
+        self.assertEqual((data['count'], data['page'], len(data['results'])), (5, 3, 1))
+
+    def test_page_past_the_end_is_empty(self):
+        response = self.get_page('page=4&page_size=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()['page'], response.json()['results']), (4, []))
+
+    def test_page_below_one_is_rejected(self):
+        for page in ('0', '-1'):
+            with self.subTest(page=page):
+                self.assertEqual(self.get_page(f'page={page}').status_code, 400)
+
+    def test_invalid_page_params_are_rejected(self):
+        for query in ('page=abc', 'page_size=abc'):
+            with self.subTest(query=query):
+                self.assertEqual(self.get_page(query).status_code, 400)
+
+    def test_page_size_is_at_least_one(self):
+        data = self.get_page('page_size=0').json()
+        self.assertEqual((data['page_size'], len(data['results'])), (1, 1))
@@ -5,6 +5,7 @@ from django.urls import path
 from .views import (
     upload_and_detect,
     detection_records,
+    detection_record_detail,
     violation_records,
     violation_detail,
     create_session,
@@ -18,6 +19,7 @@ urlpatterns = [
     # Detection endpoints
     path('upload/', upload_and_detect, name='upload-and-detect'),
     path('records/', detection_records, name='detection-records'),
+    path('records/<str:frame_id>/', detection_record_detail, name='detection-record-detail'),
     path('health/', health_check, name='health-check'),
 
     # Violation endpoints
@@ -11,10 +11,14 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.shortcuts import get_object_or_404
 from django.conf import settings
+from django.core.paginator import Paginator, EmptyPage, InvalidPage, PageNotAnInteger
+from django.core.files.base import ContentFile
+from django.db import transaction
 
 from .models import DetectionRecord, ViolationRecord, DetectionSession
 from .serializers import (
     DetectionRecordSerializer,
+    DetectionRecordListSerializer,
     ViolationRecordSerializer,
     ViolationRecordUpdateSerializer,
     DetectionSessionSerializer,
@@ -24,6 +28,10 @@ from .services import PPEModelService
 
 logger = logging.getLogger('detection')
 
+# PPE types that determine violation severity when missing
+CRITICAL_PPE = frozenset({'hardHat', 'steelToedBoots'})
+HIGH_PPE = frozenset({'vest'})
+
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -58,8 +66,11 @@ def upload_and_detect(request):
         if required_ppe is None:
             required_ppe = ['hardHat', 'vest', 'gloves', 'steelToedBoots']
 
-        # Read image bytes
-        image_bytes = image_file.read()
+        # Read the upload once into a single buffer, reused for detection
+        # and for storing violation images
+        image_bytes = bytearray()
+        for chunk in image_file.chunks():
+            image_bytes.extend(chunk)
 
         # Run PPE detection
         result = PPEModelService.predict_from_bytes(
@@ -68,71 +79,21 @@ def upload_and_detect(request):
             required_ppe=required_ppe
         )
 
-        # Save detection record
-        detection_record = DetectionRecord.objects.create(
-            frame_id=result.frameId,
-            detected_count=result.detected,
-            compliant_count=result.compliant,
-            non_compliant_count=result.nonCompliant,
-            detections=result.detections,
-            session_id=session_id
+        # Build violation data for non-compliant detections and save the
+        # detection and violation records
+        violations = _build_violations(result)
+        detection_record, violation_records = _persist_detection(
+            result, violations, image_bytes, image_file.name, session_id
         )
 
-        # Save image if violations detected
-        if result.nonCompliant > 0:
-            # Generate filename and save
-            filename = f"detection_{result.frameId}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
-            # In production, save to media storage
-            # detection_record.image_path = f"media/detections/{filename}"
-
-        # Check for violations and create violation records
-        violations_created = []
-        for detection in result.detections:
-            if detection['overallStatus'] != 'compliant':
-                # Get missing PPE
-                missing_ppe = [
-                    ppe['type'] for ppe in detection['ppeStatus']
-                    if ppe['status'] == 'nonCompliant'
-                ]
-
-                # Get detected PPE
-                detected_ppe = [
-                    ppe['type'] for ppe in detection['ppeStatus']
-                    if ppe['status'] == 'compliant'
-                ]
-
-                # Get worker name from worker_id if available
-                worker_id = detection.get('workerId')
-                worker_name = None
-                if worker_id:
-                    try:
-                        from workers.models import Worker
-                        worker = Worker.objects.filter(worker_id=worker_id).first()
-                        if worker:
-                            worker_name = worker.name
-                    except Exception as e:
-                        logger.warning(f"Could not fetch worker name for {worker_id}: {e}")
-
-                # Create violation record (with image if available)
-                violation = ViolationRecord.objects.create(
-                    violation_id=str(uuid.uuid4()),
-                    worker_id=worker_id,
-                    worker_name=worker_name or worker_id or 'Unknown Worker',
-                    missing_ppe=missing_ppe,
-                    detected_ppe=detected_ppe,
-                    image=image_file,  # Store the uploaded image
-                    bounding_box=detection['boundingBox'],
-                    severity=_calculate_severity(missing_ppe)
-                )
-                violations_created.append(ViolationRecordSerializer(
-                    violation,
-                    context={'request': request}
-                ).data)
-
         # Return detection result
         response_data = result.to_dict()
         response_data['record_id'] = detection_record.id
-        response_data['violations'] = violations_created
+        response_data['violations'] = ViolationRecordSerializer(
+            violation_records,
+            many=True,
+            context={'request': request}
+        ).data
 
         return Response(response_data, status=status.HTTP_200_OK)
 
@@ -156,8 +117,11 @@ def detection_records(request):
         session_id: Filter by session ID
         start_date: Filter by start date (ISO format)
         end_date: Filter by end date (ISO format)
+
+    The per-person detections are omitted from the listing; use the
+    record detail endpoint to fetch them.
     """
-    queryset = DetectionRecord.objects.all()
+    queryset = DetectionRecord.objects.defer('detections')
 
     # Apply filters
     session_id = request.query_params.get('session_id')
@@ -173,23 +137,31 @@ def detection_records(request):
         queryset = queryset.filter(timestamp__lte=end_date)
 
     # Paginate results
-    page = request.query_params.get('page', 1)
-    page_size = request.query_params.get('page_size', 20)
-
-    start = (int(page) - 1) * int(page_size)
-    end = start + int(page_size)
-
-    records = queryset.all()[start:end]
-    total = queryset.count()
+    try:
+        count, page, page_size, object_list = _paginate(request, queryset.order_by('-timestamp'))
+    except InvalidPage as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     return Response({
-        'count': total,
-        'page': int(page),
-        'page_size': int(page_size),
-        'results': DetectionRecordSerializer(records, many=True).data
+        'count': count,
+        'page': page,
+        'page_size': page_size,
+        'results': DetectionRecordListSerializer(object_list, many=True).data
     })
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def detection_record_detail(request, frame_id):
+    """
+    Get a specific detection record including its detections.
+
+    GET /api/detection/records/{frame_id}/
+    """
+    record = get_object_or_404(DetectionRecord, frame_id=frame_id)
+    return Response(DetectionRecordSerializer(record).data)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def violation_records(request):
@@ -228,25 +200,18 @@ def violation_records(request):
     if end_date:
         queryset = queryset.filter(timestamp__lte=end_date)
 
-    # Order by most recent
-    queryset = queryset.order_by('-timestamp')
-
-    # Paginate
-    page = request.query_params.get('page', 1)
-    page_size = request.query_params.get('page_size', 20)
-
-    start = (int(page) - 1) * int(page_size)
-    end = start + int(page_size)
-
-    records = queryset.all()[start:end]
-    total = queryset.count()
+    # Paginate (most recent first)
+    try:
+        count, page, page_size, object_list = _paginate(request, queryset.order_by('-timestamp'))
+    except InvalidPage as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     return Response({
-        'count': total,
-        'page': int(page),
-        'page_size': int(page_size),
+        'count': count,
+        'page': page,
+        'page_size': page_size,
         'results': ViolationRecordSerializer(
-            records,
+            object_list,
             many=True,
             context={'request': request}
         ).data
@@ -378,6 +343,163 @@ def health_check(request):
     })
 
 
+def _paginate(request, queryset):
+    """
+    Get the page requested by the page/page_size query params.
+
+    Pages past the end are empty rather than clamped to the last page, so
+    clients paging until an empty result terminate. page_size is at least 1.
+
+    Returns:
+        Tuple of (total count, page number, page_size, page objects)
+
+    Raises:
+        InvalidPage: If page or page_size is not an integer, or page is
+            less than 1
+    """
+    try:
+        page_size = max(int(request.query_params.get('page_size', 20)), 1)
+    except ValueError:
+        raise PageNotAnInteger("page_size is not an integer")
+    try:
+        page = int(request.query_params.get('page', 1))
+    except ValueError:
+        raise PageNotAnInteger("page is not an integer")
+    if page < 1:
+        raise EmptyPage("page is less than 1")
+
+    paginator = Paginator(queryset, page_size)
+    if page > paginator.num_pages:
+        return paginator.count, page, page_size, []
+    return paginator.count, page, page_size, paginator.page(page).object_list
+
+
+def _build_violations(result):
+    """
+    Build violation data for each non-compliant person in a detection result.
+
+    Args:
+        result: DetectionResult from the PPE model
+
+    Returns:
+        List of violation dictionaries
+    """
+    violations = []
+    for detection in result.detections:
+        if detection['overallStatus'] == 'compliant':
+            continue
+
+        # Get missing and detected PPE
+        missing_ppe = [
+            ppe['type'] for ppe in detection['ppeStatus']
+            if ppe['status'] == 'nonCompliant'
+        ]
+        detected_ppe = [
+            ppe['type'] for ppe in detection['ppeStatus']
+            if ppe['status'] == 'compliant'
+        ]
+
+        violations.append({
+            'violation_id': str(uuid.uuid4()),
+            'worker_id': detection.get('workerId'),
+            'missing_ppe': missing_ppe,
+            'detected_ppe': detected_ppe,
+            'bounding_box': detection['boundingBox'],
+            'severity': _calculate_severity(missing_ppe),
+            'status': 'open',
+        })
+
+    return violations
+
+
+def _persist_detection(result, violations, image_bytes, image_name, session_id):
+    """
+    Save the detection record and its violation records in one transaction.
+
+    Args:
+        result: DetectionResult from the PPE model
+        violations: Violation dictionaries from _build_violations
+        image_bytes: Uploaded image bytes (stored with each violation)
+        image_name: Original upload filename
+        session_id: Optional detection session ID
+
+    Returns:
+        Tuple of (DetectionRecord, list of saved ViolationRecords)
+    """
+    with transaction.atomic():
+        detection_record = DetectionRecord.objects.create(
+            frame_id=result.frameId,
+            detected_count=result.detected,
+            compliant_count=result.compliant,
+            non_compliant_count=result.nonCompliant,
+            detections=result.detections,
+            session_id=session_id
+        )
+
+        violation_records = []
+        if violations:
+            violation_records = ViolationRecord.objects.bulk_create(
+                _build_violation_records(violations, image_bytes, image_name),
+                batch_size=50
+            )
+
+            # Backends that cannot return ids from a bulk insert (MySQL)
+            # leave pk unset; look them up in one query
+            if violation_records[0].pk is None:
+                ids = dict(ViolationRecord.objects.filter(
+                    violation_id__in=[record.violation_id for record in violation_records]
+                ).values_list('violation_id', 'id'))
+                for record in violation_records:
+                    record.pk = ids[record.violation_id]
+
+    return detection_record, violation_records
+
+
+def _build_violation_records(violations, image_bytes, image_name):
+    """
+    Build unsaved ViolationRecord instances for bulk creation.
+
+    Args:
+        violations: Violation dictionaries from _build_violations
+        image_bytes: Uploaded image bytes (stored with each violation)
+        image_name: Original upload filename
+
+    Returns:
+        List of ViolationRecord instances
+    """
+    # Get name and department of recognized workers in one query
+    worker_ids = {v['worker_id'] for v in violations if v['worker_id']}
+    workers = {}
+    if worker_ids:
+        try:
+            from workers.models import Worker
+            workers = {
+                worker_id: (name, department)
+                for worker_id, name, department in Worker.objects.filter(
+                    worker_id__in=worker_ids
+                ).values_list('worker_id', 'name', 'department')
+            }
+        except Exception as e:
+            logger.warning(f"Could not fetch workers {worker_ids}: {e}")
+
+    records = []
+    for v in violations:
+        name, department = workers.get(v['worker_id'], (None, None))
+        records.append(ViolationRecord(
+            violation_id=v['violation_id'],
+            worker_id=v['worker_id'],
+            worker_name=name or v['worker_id'] or 'Unknown Worker',
+            worker_department=department,
+            missing_ppe=v['missing_ppe'],
+            detected_ppe=v['detected_ppe'],
+            image=ContentFile(image_bytes, name=image_name),  # Store the uploaded image
+            bounding_box=v['bounding_box'],
+            severity=v['severity']
+        ))
+
+    return records
+
+
 def _calculate_severity(missing_ppe):
     """
     Calculate severity level based on missing PPE.
@@ -388,12 +510,11 @@ def _calculate_severity(missing_ppe):
     Returns:
         Severity level string
     """
-    critical_ppe = ['hardHat', 'steelToedBoots']
-    high_ppe = ['vest']
+    missing_set = set(missing_ppe)
 
-    if any(ppe in critical_ppe for ppe in missing_ppe):
+    if missing_set & CRITICAL_PPE:
         return 'critical'
-    elif any(ppe in high_ppe for ppe in missing_ppe):
+    elif missing_set & HIGH_PPE:
         return 'high'
     elif len(missing_ppe) >= 2:
         return 'medium'
@@ -2,7 +2,7 @@
 Admin configuration for Reports app.
 """
 from django.contrib import admin
-from .models import ReportSchedule, GeneratedReport
+from .models import ReportSchedule, GeneratedReport, DailyDetectionRollup
 
 
 @admin.register(ReportSchedule)
@@ -23,3 +23,12 @@ class GeneratedReportAdmin(admin.ModelAdmin):
     search_fields = ['title', 'report_id']
     ordering = ['-created_at']
     readonly_fields = ['report_id', 'created_at', 'completed_at', 'file_size']
+
+
+@admin.register(DailyDetectionRollup)
+class DailyDetectionRollupAdmin(admin.ModelAdmin):
+    """Admin interface for DailyDetectionRollup model."""
+    list_display = ['date', 'total_detections', 'detected', 'compliant', 'non_compliant', 'updated_at']
+    date_hierarchy = 'date'
+    ordering = ['-date']
+    readonly_fields = ['updated_at']
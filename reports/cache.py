@@ -0,0 +1,72 @@
+"""
+Cache helpers for report queries.
+
+Invalidation works by bumping a data version stored in the default cache.
+With the per-process LocMemCache backend (the default when CACHES is not
+configured) a bump only invalidates the current process; other worker
+processes keep serving their entries until REPORT_RESPONSE_TTL expires.
+Configure a shared backend (e.g. Redis) for cross-process invalidation.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.response import Response
+
+# Dashboards poll the report endpoints with identical params
+REPORT_RESPONSE_TTL = 45  # seconds
+
+# Bumped whenever detection/violation data changes, folded into response keys
+REPORT_DATA_VERSION_KEY = 'reports:data_version'
+
+
+def report_data_version():
+    """Get the current version of the report source data."""
+    return cache.get_or_set(REPORT_DATA_VERSION_KEY, lambda: int(time.time()), None)
+
+
+def bump_report_data_version():
+    """Invalidate all cached report responses."""
+    try:
+        cache.incr(REPORT_DATA_VERSION_KEY)
+    except ValueError:
+        # Key expired or was evicted; start from a fresh, unused version
+        cache.set(REPORT_DATA_VERSION_KEY, int(time.time()), None)
+
+
+def report_cache_key(view_name, query_params):
+    """
+    Build the response cache key for a report view.
+
+    Requests without an end_date cover "up to now"; the key includes the
+    current minute so those entries roll over instead of staying valid.
+    """
+    params = sorted(query_params.items())
+    if 'end_date' not in query_params:
+        params.append(('now', timezone.now().strftime('%Y-%m-%dT%H:%M')))
+    raw = f'{view_name}:{params}:{report_data_version()}'
+    return 'reports:response:' + hashlib.sha1(raw.encode()).hexdigest()
+
+
+def cache_report_response(view_func):
+    """
+    Cache the response data of a read-only report view.
+
+    Apply below @api_view/@permission_classes so authentication still runs
+    on every request.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        key = report_cache_key(view_func.__name__, request.query_params)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = view_func(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, REPORT_RESPONSE_TTL)
+        return response
+
+    return wrapper
@@ -0,0 +1,37 @@
+"""
+Refresh DailyDetectionRollup rows for completed days.
+
+Run nightly, e.g. from cron shortly after midnight:
+    python manage.py refresh_daily_rollups
+Use --days to backfill or to rebuild days whose detections were changed.
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from reports.rollups import refresh_daily_rollup
+
+
+class Command(BaseCommand):
+    help = 'Precompute daily detection totals for completed days'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=2,
+            help='Number of completed days to refresh, counting back from yesterday'
+        )
+
+    def handle(self, *args, **options):
+        yesterday = timezone.localdate() - timedelta(days=1)
+        days = max(options['days'], 1)
+
+        for offset in range(days):
+            rollup = refresh_daily_rollup(yesterday - timedelta(days=offset))
+            self.stdout.write(f"  {rollup}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed {days} daily rollup(s) up to {yesterday}"
+        ))
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.2 on 2026-10-15 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyDetectionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('total_detections', models.IntegerField(default=0)),
+                ('detected', models.IntegerField(default=0)),
+                ('compliant', models.IntegerField(default=0)),
+                ('non_compliant', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Daily Detection Rollups',
+                'db_table': 'daily_detection_rollups',
+                'ordering': ['date'],
+                'constraints': [models.UniqueConstraint(fields=('date',), name='unique_daily_rollup_date')],
+            },
+        ),
+    ]
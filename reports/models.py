@@ -2,7 +2,8 @@
 Reports module for SafeSight PPE Detection System.
 
 Note: This app primarily uses data from detection models (DetectionRecord, ViolationRecord)
-rather than defining its own models. Report generation happens on-demand via views.
+rather than defining its own models. Report generation happens on-demand via views, with
+completed days served from DailyDetectionRollup.
 """
 from django.db import models
 
@@ -119,3 +120,32 @@ class GeneratedReport(models.Model):
 
     def __str__(self):
         return f"{self.title} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
+
+
+class DailyDetectionRollup(models.Model):
+    """
+    Precomputed detection totals for one completed day.
+
+    Rows are written by the refresh_daily_rollups management command and
+    read by the summary and compliance reports in place of rescanning
+    detection_records for days that can no longer change.
+    """
+    date = models.DateField()
+
+    total_detections = models.IntegerField(default=0)
+    detected = models.IntegerField(default=0)
+    compliant = models.IntegerField(default=0)
+    non_compliant = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'daily_detection_rollups'
+        verbose_name_plural = "Daily Detection Rollups"
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(fields=['date'], name='unique_daily_rollup_date'),
+        ]
+
+    def __str__(self):
+        return f"Rollup {self.date}: {self.total_detections} detections"
@@ -0,0 +1,100 @@
+"""
+Daily detection rollups for reports.
+
+Detections for a completed day do not change, so their per-day totals are
+stored in DailyDetectionRollup and read back instead of aggregating
+detection_records on every report request.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate, Coalesce
+from django.utils import timezone
+
+from detection.models import DetectionRecord
+from .models import DailyDetectionRollup
+
+
+def _day_start(day):
+    """Get the aware datetime at which a day starts."""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def refresh_daily_rollup(day):
+    """Recompute and store the detection totals for a single day."""
+    totals = DetectionRecord.objects.filter(
+        timestamp__gte=_day_start(day),
+        timestamp__lt=_day_start(day + timedelta(days=1))
+    ).aggregate(
+        total_detections=Count('id'),
+        detected=Coalesce(Sum('detected_count'), 0),
+        compliant=Coalesce(Sum('compliant_count'), 0),
+        non_compliant=Coalesce(Sum('non_compliant_count'), 0)
+    )
+    rollup, _ = DailyDetectionRollup.objects.update_or_create(date=day, defaults=totals)
+    return rollup
+
+
+def _live_daily_stats(detections_qs):
+    return list(detections_qs.annotate(
+        date=TruncDate('timestamp')
+    ).values('date').annotate(
+        detections=Count('id'),
+        detected=Coalesce(Sum('detected_count'), 0),
+        compliant=Coalesce(Sum('compliant_count'), 0),
+        non_compliant=Coalesce(Sum('non_compliant_count'), 0)
+    ).order_by('date'))
+
+
+def daily_detection_stats(start_date, end_date):
+    """
+    Get per-day detection totals between two datetimes.
+
+    Whole days before today are read from DailyDetectionRollup; partial days
+    at either end of the range and today are aggregated live. If any whole
+    day has not been rolled up yet the full range is aggregated live.
+
+    Returns:
+        List of dicts with date, detections, detected, compliant and
+        non_compliant, ordered by date
+    """
+    detections_qs = DetectionRecord.objects.filter(
+        timestamp__gte=start_date,
+        timestamp__lte=end_date
+    )
+
+    first_day = timezone.localtime(start_date).date()
+    if _day_start(first_day) < start_date:
+        first_day += timedelta(days=1)
+    last_day = min(
+        timezone.localtime(end_date).date(),
+        timezone.localdate()
+    ) - timedelta(days=1)
+
+    if first_day > last_day:
+        return _live_daily_stats(detections_qs)
+
+    rollups = list(DailyDetectionRollup.objects.filter(
+        date__gte=first_day,
+        date__lte=last_day
+    ))
+    if len(rollups) != (last_day - first_day).days + 1:
+        return _live_daily_stats(detections_qs)
+
+    rows = _live_daily_stats(detections_qs.exclude(
+        timestamp__gte=_day_start(first_day),
+        timestamp__lt=_day_start(last_day + timedelta(days=1))
+    ))
+    rows.extend(
+        {
+            'date': rollup.date,
+            'detections': rollup.total_detections,
+            'detected': rollup.detected,
+            'compliant': rollup.compliant,
+            'non_compliant': rollup.non_compliant
+        }
+        for rollup in rollups
+        if rollup.total_detections
+    )
+    rows.sort(key=lambda row: row['date'])
+    return rows
@@ -0,0 +1,16 @@
+"""
+Signal handlers keeping report caches in sync with the data they summarize.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from detection.models import DetectionRecord, ViolationRecord
+from .cache import bump_report_data_version
+
+
+@receiver([post_save, post_delete], sender=DetectionRecord)
+@receiver([post_save, post_delete], sender=ViolationRecord)
+def report_data_changed(sender, instance, **kwargs):
+    """Invalidate cached report responses once the change is committed."""
+    transaction.on_commit(bump_report_data_version)
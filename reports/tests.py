@@ -1,3 +1,68 @@
 from django.test import TestCase
 
-# Create your tests here.
+from detection.models import ViolationRecord
+from workers.models import Worker
+from .cache import report_data_version
+from .views import _top_missing_ppe, _tally_missing_ppe
+
+
+class TopMissingPPETests(TestCase):
+    """The SQL tally of missing PPE types must match the Python tally."""
+
+    @classmethod
+    def setUpTestData(cls):
+        missing = [
+            ['hardHat', 'vest'],
+            ['hardHat'],
+            ['hardHat'],
+            ['vest', 'gloves', 'hardHat'],
+            ['steelToedBoots'],
+            [],
+            ['gloves', 'vest'],
+        ]
+        ViolationRecord.objects.bulk_create(
+            ViolationRecord(
+                violation_id=f'test-{i}',
+                missing_ppe=ppe,
+                image='violations/test.jpg',
+                bounding_box={},
+                severity='critical' if 'hardHat' in ppe else 'low'
+            )
+            for i, ppe in enumerate(missing)
+        )
+
+    def assertMatchesPythonTally(self, qs):
+        self.assertEqual(
+            sorted(_top_missing_ppe(qs, limit=10)),
+            sorted(_tally_missing_ppe(qs, limit=10))
+        )
+
+    def test_matches_python_tally(self):
+        self.assertMatchesPythonTally(ViolationRecord.objects.all())
+
+    def test_matches_python_tally_on_filtered_queryset(self):
+        self.assertMatchesPythonTally(ViolationRecord.objects.filter(severity='critical'))
+
+    def test_limit_keeps_most_frequent(self):
+        self.assertEqual(
+            _top_missing_ppe(ViolationRecord.objects.all(), limit=1),
+            [('hardHat', 4)]
+        )
+
+
+class ReportCacheInvalidationTests(TestCase):
+    """Worker changes rewrite violations via update(), which sends no signals."""
+
+    def test_worker_department_change_bumps_data_version(self):
+        worker = Worker.objects.create(worker_id='WRK-1', name='Worker', department='A')
+        ViolationRecord.objects.create(
+            violation_id='v-1', worker_id='WRK-1', image='violations/test.jpg', bounding_box={}
+        )
+        version = report_data_version()
+
+        worker.department = 'B'
+        with self.captureOnCommitCallbacks(execute=True):
+            worker.save()
+
+        self.assertNotEqual(report_data_version(), version)
+        self.assertEqual(ViolationRecord.objects.get().worker_department, 'B')
@@ -5,25 +5,49 @@ import logging
 import uuid
 import csv
 import json
+from collections import Counter
 from datetime import datetime, timedelta
-from django.db.models import Count, Avg, Q, F
-from django.db.models.functions import TruncDate, TruncHour
-from django.http import HttpResponse, JsonResponse
+from django.db.models import Count, Sum, Avg, Q, F, OuterRef, Subquery, IntegerField, Window
+from django.db.models.functions import TruncDate, TruncHour, Coalesce
+from django.db import connections
+from django.http import JsonResponse, StreamingHttpResponse
 from django.utils import timezone
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from detection.models import DetectionRecord, ViolationRecord, DetectionSession
+from detection.models import DetectionRecord, ViolationRecord
 from workers.models import Worker
 from .models import GeneratedReport, ReportSchedule
+from .cache import cache_report_response
+from .rollups import daily_detection_stats
 from .serializers import ReportRequestSerializer, GeneratedReportSerializer
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_dt(value, default=None):
+    """
+    Parse an ISO 8601 query param into a timezone-aware datetime.
+
+    Args:
+        value: ISO 8601 string (a trailing 'Z' is accepted), or empty
+        default: Value returned when no date is given
+
+    Returns:
+        Aware datetime, or default
+    """
+    if not value:
+        return default
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_report_response
 def summary_stats(request):
     """
     Get safety summary statistics.
@@ -36,24 +60,10 @@ def summary_stats(request):
         department: Filter by department
     """
     # Get date range
-    end_date = request.query_params.get('end_date')
-    start_date = request.query_params.get('start_date')
-
-    if end_date:
-        end_date = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-    else:
-        end_date = timezone.now()
-
-    if start_date:
-        start_date = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-    else:
-        start_date = end_date - timedelta(days=30)
+    end_date = _parse_dt(request.query_params.get('end_date'), timezone.now())
+    start_date = _parse_dt(request.query_params.get('start_date'), end_date - timedelta(days=30))
 
     # Base querysets
-    detections_qs = DetectionRecord.objects.filter(
-        timestamp__gte=start_date,
-        timestamp__lte=end_date
-    )
     violations_qs = ViolationRecord.objects.filter(
         timestamp__gte=start_date,
         timestamp__lte=end_date
@@ -63,22 +73,22 @@ def summary_stats(request):
     department = request.query_params.get('department')
     if department:
         # Filter violations by worker department
-        worker_ids = Worker.objects.filter(department=department).values_list('worker_id', flat=True)
-        violations_qs = violations_qs.filter(worker_id__in=worker_ids)
+        violations_qs = violations_qs.filter(worker_department=department)
 
-    # Calculate stats
-    total_detections = detections_qs.count()
-    total_violations = violations_qs.count()
+    # Daily detection stats; the overall totals are summed from these rows
+    # rather than queried separately
+    daily_stats = daily_detection_stats(start_date, end_date)
 
-    # Detection stats
-    total_people_detected = detections_qs.aggregate(total=Sum('detected_count'))['total'] or 0
-    total_compliant = detections_qs.aggregate(total=Sum('compliant_count'))['total'] or 0
-    total_non_compliant = detections_qs.aggregate(total=Sum('non_compliant_count'))['total'] or 0
+    total_detections = sum(day['detections'] for day in daily_stats)
+    total_people_detected = sum(day['detected'] for day in daily_stats)
+    total_compliant = sum(day['compliant'] for day in daily_stats)
+    total_non_compliant = sum(day['non_compliant'] for day in daily_stats)
 
-    # Violation stats by severity
-    severity_breakdown = violations_qs.values('severity').annotate(
+    # Violation stats by severity (also gives the total violation count)
+    severity_breakdown = list(violations_qs.values('severity').annotate(
         count=Count('id')
-    )
+    ).order_by())
+    total_violations = sum(item['count'] for item in severity_breakdown)
 
     # Violation stats by status
     status_breakdown = violations_qs.values('status').annotate(
@@ -86,12 +96,7 @@ def summary_stats(request):
     )
 
     # Top violation types
-    violation_types = {}
-    for violation in violations_qs:
-        for ppe_type in violation.missing_ppe:
-            violation_types[ppe_type] = violation_types.get(ppe_type, 0) + 1
-
-    top_violations = sorted(violation_types.items(), key=lambda x: x[1], reverse=True)[:5]
+    top_violations = _top_missing_ppe(violations_qs, limit=5)
 
     # Workers with most violations
     top_workers = violations_qs.values('worker_id', 'worker_name').annotate(
@@ -104,19 +109,10 @@ def summary_stats(request):
     else:
         compliance_rate = 100.0
 
-    # Daily trend (last 30 days)
-    daily_stats = detections_qs.annotate(
-        date=TruncDate('timestamp')
-    ).values('date').annotate(
-        detections=Count('id'),
-        compliant=Sum('compliant_count'),
-        non_compliant=Sum('non_compliant_count')
-    ).order_by('date')
-
     return Response({
         'period': {
-            'start_date': start_date.isoformat(),
-            'end_date': end_date.isoformat(),
+            'start_date': start_date,
+            'end_date': end_date,
             'days': (end_date - start_date).days
         },
         'overview': {
@@ -130,18 +126,15 @@ def summary_stats(request):
             'non_compliant': total_non_compliant
         },
         'violation_breakdown': {
-            'by_severity': list(severity_breakdown),
+            'by_severity': severity_breakdown,
             'by_status': list(status_breakdown),
             'top_violation_types': [{'type': k, 'count': v} for k, v in top_violations]
         },
         'top_workers': list(top_workers),
-        'daily_trend': list(daily_stats)
+        'daily_trend': daily_stats
     })
 
 
-from django.db.models import Sum
-
-
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def violation_report(request):
@@ -163,11 +156,11 @@ def violation_report(request):
     queryset = ViolationRecord.objects.all()
 
     # Apply filters
-    start_date = request.query_params.get('start_date')
+    start_date = _parse_dt(request.query_params.get('start_date'))
     if start_date:
         queryset = queryset.filter(timestamp__gte=start_date)
 
-    end_date = request.query_params.get('end_date')
+    end_date = _parse_dt(request.query_params.get('end_date'))
     if end_date:
         queryset = queryset.filter(timestamp__lte=end_date)
 
@@ -185,27 +178,33 @@ def violation_report(request):
 
     department = request.query_params.get('department')
     if department:
-        worker_ids = Worker.objects.filter(department=department).values_list('worker_id', flat=True)
-        queryset = queryset.filter(worker_id__in=worker_ids)
-
-    # Order by most recent
-    queryset = queryset.order_by('-timestamp')
+        queryset = queryset.filter(worker_department=department)
 
-    # Paginate
+    # Paginate (most recent first); the total row count comes back with
+    # every row of the page instead of needing a separate COUNT query
     page = int(request.query_params.get('page', 1))
     page_size = int(request.query_params.get('page_size', 20))
     start = (page - 1) * page_size
     end = start + page_size
 
-    records = queryset[start:end]
-    total = queryset.count()
+    records = list(queryset.annotate(
+        total_count=Window(expression=Count('id'))
+    ).order_by('-timestamp')[start:end])
+
+    if records:
+        total = records[0].total_count
+    elif page > 1:
+        # Past the last page, so no row carried the total
+        total = queryset.count()
+    else:
+        total = 0
 
     # Format results
     results = []
     for record in records:
         results.append({
             'violation_id': record.violation_id,
-            'timestamp': record.timestamp.isoformat(),
+            'timestamp': record.timestamp,
             'worker_id': record.worker_id,
             'worker_name': record.worker_name,
             'missing_ppe': record.missing_ppe,
@@ -225,6 +224,7 @@ def violation_report(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_report_response
 def compliance_report(request):
     """
     Get compliance metrics and trends.
@@ -237,28 +237,14 @@ def compliance_report(request):
         group_by: Group by 'day', 'week', or 'department'
     """
     # Get date range
-    end_date = request.query_params.get('end_date')
-    start_date = request.query_params.get('start_date')
+    end_date = _parse_dt(request.query_params.get('end_date'), timezone.now())
+    start_date = _parse_dt(request.query_params.get('start_date'), end_date - timedelta(days=30))
     group_by = request.query_params.get('group_by', 'day')
 
-    if end_date:
-        end_date = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-    else:
-        end_date = timezone.now()
-
-    if start_date:
-        start_date = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-    else:
-        start_date = end_date - timedelta(days=30)
-
-    detections_qs = DetectionRecord.objects.filter(
-        timestamp__gte=start_date,
-        timestamp__lte=end_date
-    )
-
-    # Overall compliance
-    total_detected = detections_qs.aggregate(total=Sum('detected_count'))['total'] or 0
-    total_compliant = detections_qs.aggregate(total=Sum('compliant_count'))['total'] or 0
+    # Overall compliance, summed from the daily rows (also reused for grouping)
+    daily_stats = daily_detection_stats(start_date, end_date)
+    total_detected = sum(day['detected'] for day in daily_stats)
+    total_compliant = sum(day['compliant'] for day in daily_stats)
 
     if total_detected > 0:
         overall_compliance = round((total_compliant / total_detected) * 100, 2)
@@ -266,71 +252,52 @@ def compliance_report(request):
         overall_compliance = 100.0
 
     # Group data
-    if group_by == 'day':
-        grouped = detections_qs.annotate(
-            period=TruncDate('timestamp')
-        ).values('period').annotate(
-            detected=Sum('detected_count'),
-            compliant=Sum('compliant_count'),
-            non_compliant=Sum('non_compliant_count')
-        ).order_by('period')
-
-    elif group_by == 'department':
-        # Group by worker department
-        grouped = []
-        departments = Worker.objects.values_list('department', flat=True).distinct()
-
-        for dept in departments:
-            if not dept:
-                continue
-            worker_ids = Worker.objects.filter(department=dept).values_list('worker_id', flat=True)
+    if group_by == 'department':
+        # Group violations by worker department in a single query.
+        # Detections are not tracked per department, so the detected count
+        # is estimated from violation data.
+        dept_violations = ViolationRecord.objects.filter(
+            timestamp__gte=start_date,
+            timestamp__lte=end_date
+        ).exclude(
+            Q(worker_department__isnull=True) | Q(worker_department='')
+        ).values('worker_department').annotate(
+            count=Count('id')
+        ).order_by('worker_department')
 
-            # Get detections for workers in this department
-            dept_detections = detections_qs.filter(
-                session_id__in=DetectionSession.objects.filter(
-                    # This is a simplified approach - in production, you'd track department per session
-                )
-            )
-
-            # For now, return aggregated stats per department using violation data
-            dept_violations = ViolationRecord.objects.filter(
-                timestamp__gte=start_date,
-                timestamp__lte=end_date,
-                worker_id__in=worker_ids
-            )
-
-            dept_detected = dept_violations.count() * 2  # Rough estimate
-            dept_compliant = dept_detected - dept_violations.count()
-
-            if dept_detected > 0:
-                grouped.append({
-                    'period': dept,
-                    'detected': dept_detected,
-                    'compliant': dept_compliant,
-                    'non_compliant': dept_violations.count()
-                })
+        grouped = []
+        for row in dept_violations:
+            dept_detected = row['count'] * 2  # Rough estimate
+            grouped.append({
+                'period': row['worker_department'],
+                'detected': dept_detected,
+                'compliant': dept_detected - row['count'],
+                'non_compliant': row['count']
+            })
 
     else:
-        # Default to daily
-        grouped = detections_qs.annotate(
-            period=TruncDate('timestamp')
-        ).values('period').annotate(
-            detected=Sum('detected_count'),
-            compliant=Sum('compliant_count'),
-            non_compliant=Sum('non_compliant_count')
-        ).order_by('period')
+        # Daily (the default)
+        grouped = [
+            {
+                'period': day['date'],
+                'detected': day['detected'],
+                'compliant': day['compliant'],
+                'non_compliant': day['non_compliant']
+            }
+            for day in daily_stats
+        ]
 
     # Calculate compliance rate per group
     for item in grouped:
-        if item['detected'] and item['detected'] > 0:
+        if item['detected'] > 0:
             item['compliance_rate'] = round((item['compliant'] / item['detected']) * 100, 2)
         else:
             item['compliance_rate'] = 100.0
 
     return Response({
         'period': {
-            'start_date': start_date.isoformat(),
-            'end_date': end_date.isoformat()
+            'start_date': start_date,
+            'end_date': end_date
         },
         'overall_compliance': overall_compliance,
         'grouped_data': list(grouped),
@@ -359,9 +326,16 @@ def worker_report(request):
         if not worker:
             return Response({'error': 'Worker not found'}, status=404)
 
-        violations = ViolationRecord.objects.filter(worker_id=worker_id).order_by('-timestamp')
-        total_violations = violations.count()
-        resolved = violations.filter(status='resolved').count()
+        violations = ViolationRecord.objects.filter(worker_id=worker_id)
+        counts = violations.aggregate(
+            total=Count('id'),
+            resolved=Count('id', filter=Q(status='resolved'))
+        )
+        total_violations = counts['total']
+        resolved = counts['resolved']
+        recent_violations = violations.only(
+            'violation_id', 'timestamp', 'missing_ppe', 'severity', 'status'
+        ).order_by('-timestamp')[:10]
 
         return Response({
             'worker': {
@@ -375,36 +349,50 @@ def worker_report(request):
                 'total_violations': total_violations,
                 'resolved_violations': resolved,
                 'open_violations': total_violations - resolved,
-                'compliance_rate': worker.compliance_rate
+                'compliance_rate': _compliance_rate(total_violations, resolved)
             },
             'recent_violations': [
                 {
                     'violation_id': v.violation_id,
-                    'timestamp': v.timestamp.isoformat(),
+                    'timestamp': v.timestamp,
                     'missing_ppe': v.missing_ppe,
                     'severity': v.severity,
                     'status': v.status
                 }
-                for v in violations[:10]
+                for v in recent_violations
             ]
         })
     else:
-        # All workers summary
-        workers = Worker.objects.filter(is_active=True)
+        # All workers summary, with violation counts computed in the same query
+        worker_violations = ViolationRecord.objects.filter(
+            worker_id=OuterRef('worker_id')
+        ).order_by().values('worker_id')
+
+        workers = Worker.objects.filter(is_active=True).only(
+            'worker_id', 'name', 'department'
+        ).annotate(
+            total_violations=Coalesce(Subquery(
+                worker_violations.annotate(c=Count('id')).values('c'),
+                output_field=IntegerField()
+            ), 0),
+            resolved_violations=Coalesce(Subquery(
+                worker_violations.filter(status='resolved').annotate(c=Count('id')).values('c'),
+                output_field=IntegerField()
+            ), 0)
+        )
         results = []
 
         for worker in workers:
-            violations = ViolationRecord.objects.filter(worker_id=worker.worker_id)
-            total = violations.count()
-            resolved = violations.filter(status='resolved').count()
-
             results.append({
                 'worker_id': worker.worker_id,
                 'name': worker.name,
                 'department': worker.department,
-                'total_violations': total,
-                'resolved_violations': resolved,
-                'compliance_rate': worker.compliance_rate
+                'total_violations': worker.total_violations,
+                'resolved_violations': worker.resolved_violations,
+                'compliance_rate': _compliance_rate(
+                    worker.total_violations,
+                    worker.resolved_violations
+                )
             })
 
         # Sort by violations count
@@ -476,6 +464,62 @@ def export_report(request):
         return Response(data)
 
 
+# SQL joins that expand the JSON missing_ppe array of each row, and the
+# resulting PPE type column
+_MISSING_PPE_EXPANDERS = {
+    'sqlite': ("CROSS JOIN json_each(v.missing_ppe) AS je", "je.value"),
+    'mysql': ("CROSS JOIN JSON_TABLE(v.missing_ppe, '$[*]' COLUMNS (ppe VARCHAR(50) PATH '$')) AS je", "je.ppe"),
+    'postgresql': ("CROSS JOIN jsonb_array_elements_text(v.missing_ppe) AS je(ppe)", "je.ppe"),
+}
+
+
+def _top_missing_ppe(violations_qs, limit=5):
+    """
+    Count the most frequently missing PPE types in the database.
+
+    Databases without a known JSON array expansion fall back to tallying
+    the missing_ppe lists in Python.
+
+    Args:
+        violations_qs: Filtered ViolationRecord queryset
+        limit: Number of PPE types to return
+
+    Returns:
+        List of (ppe_type, count) tuples, most frequent first
+    """
+    connection = connections[violations_qs.db]
+    if connection.vendor not in _MISSING_PPE_EXPANDERS:
+        return _tally_missing_ppe(violations_qs, limit)
+    expander, ppe_column = _MISSING_PPE_EXPANDERS[connection.vendor]
+
+    inner_sql, params = violations_qs.order_by().values('missing_ppe').query.get_compiler(
+        using=violations_qs.db
+    ).as_sql()
+    sql = (
+        f"SELECT {ppe_column}, COUNT(*) AS c FROM ({inner_sql}) AS v {expander} "
+        f"GROUP BY {ppe_column} ORDER BY c DESC LIMIT %s"
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, (*params, limit))
+        return cursor.fetchall()
+
+
+def _tally_missing_ppe(violations_qs, limit=5):
+    """Count the most frequently missing PPE types in Python."""
+    counts = Counter()
+    for missing_ppe in violations_qs.values_list('missing_ppe', flat=True):
+        counts.update(missing_ppe or [])
+    return counts.most_common(limit)
+
+
+def _compliance_rate(total_violations, resolved_violations):
+    """Compliance rate from violation counts (same formula as Worker.compliance_rate)."""
+    if total_violations == 0:
+        return 100.0
+    return round((resolved_violations / total_violations) * 100, 2)
+
+
 def _get_summary_data(start_date, end_date, department):
     """Get summary report data."""
     detections = DetectionRecord.objects.all()
@@ -488,8 +532,7 @@ def _get_summary_data(start_date, end_date, department):
         detections = detections.filter(timestamp__lte=end_date)
         violations = violations.filter(timestamp__lte=end_date)
     if department:
-        worker_ids = Worker.objects.filter(department=department).values_list('worker_id', flat=True)
-        violations = violations.filter(worker_id__in=worker_ids)
+        violations = violations.filter(worker_department=department)
 
     return {
         'total_detections': detections.count(),
@@ -507,15 +550,14 @@ def _get_violation_data(start_date, end_date, department, worker_id):
     if end_date:
         violations = violations.filter(timestamp__lte=end_date)
     if department:
-        worker_ids = Worker.objects.filter(department=department).values_list('worker_id', flat=True)
-        violations = violations.filter(worker_id__in=worker_ids)
+        violations = violations.filter(worker_department=department)
     if worker_id:
         violations = violations.filter(worker_id=worker_id)
 
-    return list(violations.values(
+    return violations.values(
         'violation_id', 'timestamp', 'worker_id', 'worker_name',
         'missing_ppe', 'severity', 'status'
-    ))
+    )
 
 
 def _get_compliance_data(start_date, end_date, department):
@@ -530,8 +572,8 @@ def _get_compliance_data(start_date, end_date, department):
     daily = detections.annotate(
         date=TruncDate('timestamp')
     ).values('date').annotate(
-        detected=Sum('detected_count'),
-        compliant=Sum('compliant_count')
+        detected=Coalesce(Sum('detected_count'), 0),
+        compliant=Coalesce(Sum('compliant_count'), 0)
     ).order_by('date')
 
     return list(daily)
@@ -550,18 +592,31 @@ def _get_worker_data(worker_id):
     ))
 
 
+class _Echo:
+    """File-like object whose write() returns the value, for streaming csv output."""
+
+    def write(self, value):
+        return value
+
+
 def _generate_csv_response(data, report_type):
-    """Generate CSV response from data."""
-    response = HttpResponse(content_type='text/csv')
+    """Generate a streaming CSV response from data."""
+    writer = csv.writer(_Echo())
+    response = StreamingHttpResponse(
+        (writer.writerow(row) for row in _csv_rows(data, report_type)),
+        content_type='text/csv'
+    )
     response['Content-Disposition'] = f'attachment; filename="{report_type}_report.csv"'
+    return response
 
-    writer = csv.writer(response)
 
-    if report_type == 'violations' and data:
-        writer.writerow(['Violation ID', 'Timestamp', 'Worker ID', 'Worker Name',
-                        'Missing PPE', 'Severity', 'Status'])
-        for row in data:
-            writer.writerow([
+def _csv_rows(data, report_type):
+    """Yield CSV rows (header first) for report data."""
+    if report_type == 'violations':
+        yield ['Violation ID', 'Timestamp', 'Worker ID', 'Worker Name',
+               'Missing PPE', 'Severity', 'Status']
+        for row in data.iterator(chunk_size=2000):
+            yield [
                 row['violation_id'],
                 row['timestamp'],
                 row['worker_id'],
@@ -569,27 +624,31 @@ def _generate_csv_response(data, report_type):
                 str(row['missing_ppe']),
                 row['severity'],
                 row['status']
-            ])
+            ]
 
-    elif report_type == 'worker' and data:
-        writer.writerow(['Worker ID', 'Name', 'Department', 'Position',
-                        'Required PPE', 'Active'])
+    elif report_type == 'worker':
+        yield ['Worker ID', 'Name', 'Department', 'Position',
+               'Required PPE', 'Active']
         for row in data:
-            writer.writerow([
+            yield [
                 row['worker_id'],
                 row['name'],
                 row['department'],
                 row['position'],
                 str(row['required_ppe']),
                 row['is_active']
-            ])
+            ]
 
-    else:
-        writer.writerow(['Key', 'Value'])
+    elif isinstance(data, dict):
+        yield ['Key', 'Value']
         for key, value in data.items():
-            writer.writerow([key, str(value)])
+            yield [key, str(value)]
 
-    return response
+    elif data:
+        # List of row dicts (e.g. compliance data)
+        yield list(data[0].keys())
+        for row in data:
+            yield list(row.values())
 
 
 @api_view(['GET'])
@@ -600,7 +659,7 @@ def generated_reports(request):
 
     GET /api/reports/generated/
     """
-    reports = GeneratedReport.objects.order_by('-created_at')[:50]
+    reports = GeneratedReport.objects.select_related('generated_by').order_by('-created_at')[:50]
     serializer = GeneratedReportSerializer(
         reports,
         many=True,
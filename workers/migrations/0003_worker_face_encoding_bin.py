@@ -0,0 +1,42 @@
+# Generated migration for binary face encodings
+
+import numpy as np
+from django.db import migrations, models
+
+
+def copy_face_encodings(apps, schema_editor):
+    """Populate face_encoding_bin from the JSON face_encoding column."""
+    Worker = apps.get_model('workers', 'Worker')
+    workers = list(Worker.objects.filter(face_encoding__isnull=False).only('id', 'face_encoding'))
+    for worker in workers:
+        worker.face_encoding_bin = np.asarray(worker.face_encoding, dtype=np.float32).tobytes()
+    Worker.objects.bulk_update(workers, ['face_encoding_bin'], batch_size=200)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workers', '0002_worker_face_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='worker',
+            name='face_encoding_bin',
+            field=models.BinaryField(
+                blank=True,
+                null=True,
+                help_text='Cached 128-dimensional face encoding vector as float32 bytes'
+            ),
+        ),
+        migrations.AlterField(
+            model_name='worker',
+            name='face_encoding',
+            field=models.JSONField(
+                blank=True,
+                null=True,
+                help_text='Cached 128-dimensional face encoding vector (legacy JSON copy)'
+            ),
+        ),
+        migrations.RunPython(copy_face_encodings, migrations.RunPython.noop),
+    ]
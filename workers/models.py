@@ -2,9 +2,32 @@
 Worker management models for SafeSight PPE Detection System.
 """
 from django.db import models
+from django.db.models import Count, Q
 from django.conf import settings
+from django.utils.functional import cached_property
+from functools import lru_cache
+from types import MappingProxyType
 import os
 
+import numpy as np
+
+
+# Human-readable names for PPE type codes
+PPE_DISPLAY_NAMES = MappingProxyType({
+    'hardHat': 'Hard Hat',
+    'safetyGlasses': 'Safety Glasses',
+    'vest': 'Safety Vest',
+    'gloves': 'Gloves',
+    'steelToedBoots': 'Steel-Toed Boots',
+    'earProtection': 'Ear Protection',
+})
+
+
+@lru_cache(maxsize=256)
+def ppe_display_names(ppe_codes):
+    """Map a tuple of PPE codes to their display names (memoized per process)."""
+    return tuple(PPE_DISPLAY_NAMES.get(ppe, ppe) for ppe in ppe_codes)
+
 
 def worker_photo_upload_path(instance, filename):
     """Generate upload path for worker photos."""
@@ -68,7 +91,13 @@ class Worker(models.Model):
     face_encoding = models.JSONField(
         blank=True,
         null=True,
-        help_text="Cached 128-dimensional face encoding vector"
+        help_text="Cached 128-dimensional face encoding vector (legacy JSON copy)"
+    )
+
+    face_encoding_bin = models.BinaryField(
+        blank=True,
+        null=True,
+        help_text="Cached 128-dimensional face encoding vector as float32 bytes"
     )
 
     face_photo_valid = models.BooleanField(
@@ -125,31 +154,39 @@ class Worker(models.Model):
 
     def get_required_ppe_display(self):
         """Return human-readable list of required PPE."""
-        ppe_names = {
-            'hardHat': 'Hard Hat',
-            'safetyGlasses': 'Safety Glasses',
-            'vest': 'Safety Vest',
-            'gloves': 'Gloves',
-            'steelToedBoots': 'Steel-Toed Boots',
-            'earProtection': 'Ear Protection',
-        }
         ppe_list = self.required_ppe
         if isinstance(ppe_list, str):
             ppe_list = [p.strip() for p in ppe_list.split(',') if p.strip()]
-        return [ppe_names.get(ppe, ppe) for ppe in (ppe_list or [])]
+        # Unvalidated JSON may hold nested lists/dicts; stringify them so
+        # the cache key stays hashable
+        ppe_codes = tuple(ppe if isinstance(ppe, str) else str(ppe) for ppe in (ppe_list or ()))
+        return list(ppe_display_names(ppe_codes))
 
     @property
+    def face_encoding_array(self):
+        """Face encoding as a float32 NumPy vector, or None if not set."""
+        if self.face_encoding_bin is None:
+            return None
+        return np.frombuffer(self.face_encoding_bin, dtype=np.float32)
+
+    @face_encoding_array.setter
+    def face_encoding_array(self, vector):
+        if vector is None:
+            self.face_encoding_bin = None
+        else:
+            self.face_encoding_bin = np.asarray(vector, dtype=np.float32).tobytes()
+
+    @cached_property
     def compliance_rate(self):
         """Calculate worker's compliance rate based on violations."""
         from detection.models import ViolationRecord
-        total = ViolationRecord.objects.filter(worker_id=self.worker_id).count()
-        resolved = ViolationRecord.objects.filter(
-            worker_id=self.worker_id,
-            status='resolved'
-        ).count()
-        if total == 0:
+        counts = ViolationRecord.objects.filter(worker_id=self.worker_id).aggregate(
+            total=Count('id'),
+            resolved=Count('id', filter=Q(status='resolved'))
+        )
+        if counts['total'] == 0:
             return 100.0
-        return round((resolved / total) * 100, 2)
+        return round((counts['resolved'] / counts['total']) * 100, 2)
 
 
 class WorkerShift(models.Model):
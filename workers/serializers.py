@@ -1,58 +1,184 @@
 """
 Serializers for Workers app.
 """
+from functools import lru_cache
+
+from django.db.models import F, Prefetch, Window
+from django.db.models.manager import BaseManager
+from django.db.models.functions import RowNumber
+from django.utils.functional import cached_property
+from drf_serializer_cache import SerializerCacheMixin
+from drf_serializer_cache.cache import CachedListSerializer
 from rest_framework import serializers
-from .models import Worker, WorkerShift
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.validators import UniqueValidator
+from .models import Worker, WorkerShift, PPE_DISPLAY_NAMES
+
+RECENT_VIOLATIONS_LIMIT = 5
+RECENT_VIOLATION_FIELDS = ('violation_id', 'timestamp', 'missing_ppe', 'status')
+RECENT_SHIFTS_LIMIT = 50
+
+ALLOWED_PPE = frozenset(PPE_DISPLAY_NAMES)
+
+
+def validate_ppe_codes(value):
+    """
+    Validate a required_ppe value against the known PPE codes.
+
+    Accepts a list of codes or a comma-separated string (multipart forms).
+    """
+    if isinstance(value, str):
+        codes = [ppe.strip() for ppe in value.split(',') if ppe.strip()]
+    elif isinstance(value, list):
+        codes = value
+    else:
+        raise serializers.ValidationError("Expected a list of PPE codes.")
+
+    invalid = [ppe for ppe in codes if not isinstance(ppe, str) or ppe not in ALLOWED_PPE]
+    if invalid:
+        raise serializers.ValidationError(f"Invalid PPE: {invalid}")
+    return value
+
+
+def recent_violations_map(worker_ids, limit=RECENT_VIOLATIONS_LIMIT):
+    """
+    Get the latest violations of several workers in a single query.
+
+    Returns:
+        Dict mapping each worker_id to its newest `limit` violations
+    """
+    from detection.models import ViolationRecord
+    violations = ViolationRecord.objects.filter(
+        worker_id__in=worker_ids
+    ).annotate(
+        row_number=Window(
+            RowNumber(),
+            partition_by=F('worker_id'),
+            order_by=F('timestamp').desc()
+        )
+    ).filter(
+        row_number__lte=limit
+    ).order_by('worker_id', '-timestamp').values_list(
+        'worker_id', *RECENT_VIOLATION_FIELDS
+    )
+
+    result = {worker_id: [] for worker_id in worker_ids}
+    for worker_id, *values in violations:
+        result[worker_id].append(dict(zip(RECENT_VIOLATION_FIELDS, values)))
+    return result
+
+
+@lru_cache(maxsize=None)
+def model_field_sources(serializer_class):
+    """
+    Get the model columns a serializer renders directly.
+
+    Used with QuerySet.only() so unrendered columns (such as the stored face
+    encodings) are not fetched, including on select_related() rows: a dotted
+    source like supervisor.name adds supervisor__name. Method fields and
+    properties are skipped.
+    """
+    model = serializer_class.Meta.model
+    concrete_fields = {field.name: field for field in model._meta.concrete_fields}
+    sources = {model._meta.pk.name}
+    for field in serializer_class().fields.values():
+        if not field.source_attrs or field.source_attrs[0] not in concrete_fields:
+            continue
+        sources.add(field.source_attrs[0])
+        if len(field.source_attrs) == 2 and concrete_fields[field.source_attrs[0]].is_relation:
+            sources.add('__'.join(field.source_attrs))
+    return tuple(sorted(sources))
+
+
+class AbsoluteURLFileField(serializers.FileField):
+    """File field rendered as an absolute URL (None without a request)."""
+
+    @cached_property
+    def base_url(self):
+        """scheme://host of the current request, or None without a request."""
+        # Resolved once per bound field, i.e. once per response
+        request = self.context.get('request')
+        if request is None:
+            return None
+        return request.build_absolute_uri('/')[:-1]
 
+    def to_representation(self, value):
+        base_url = self.base_url
+        if base_url is None or not value:
+            return None
+        url = value.url
+        return base_url + url if url.startswith('/') else url
 
-class WorkerListSerializer(serializers.ModelSerializer):
+
+class FastListSerializer(serializers.ListSerializer):
+    """
+    List serializer that resolves the child's fields once for all rows.
+
+    Only for children made of plain fields, without a custom
+    to_representation.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, BaseManager) else data
+        fields = [
+            (field.field_name, field.get_attribute, field.to_representation)
+            for field in self.child._readable_fields
+        ]
+
+        rows = []
+        for instance in iterable:
+            row = {}
+            for field_name, get_attribute, to_representation in fields:
+                try:
+                    attribute = get_attribute(instance)
+                except SkipField:
+                    continue
+                check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+                row[field_name] = None if check_for_none is None else to_representation(attribute)
+            rows.append(row)
+        return rows
+
+
+class WorkerListSerializer(SerializerCacheMixin, serializers.ModelSerializer):
     """Lightweight serializer for worker listings."""
-    photo_url = serializers.SerializerMethodField()
+    photo_url = AbsoluteURLFileField(source='photo', read_only=True)
 
     class Meta:
         model = Worker
         fields = ['id', 'worker_id', 'name', 'department', 'position', 'photo_url']
+        list_serializer_class = CachedListSerializer
 
-    def get_photo_url(self, obj):
-        if obj.photo:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.photo.url)
-        return None
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Fetch only the columns this serializer renders."""
+        return queryset.only(*model_field_sources(cls))
 
 
-class WorkerSerializer(serializers.ModelSerializer):
+class WorkerSerializer(SerializerCacheMixin, serializers.ModelSerializer):
     """Serializer for Worker model."""
-    photo_url = serializers.SerializerMethodField()
+    photo_url = AbsoluteURLFileField(source='photo', read_only=True)
     compliance_rate = serializers.ReadOnlyField()
-    supervisor_name = serializers.SerializerMethodField()
+    supervisor_name = serializers.CharField(source='supervisor.name', read_only=True, default=None)
     required_ppe_display = serializers.SerializerMethodField()
     face_photo_valid = serializers.BooleanField(read_only=True)
 
     class Meta:
         model = Worker
-        fields = ['id', 'worker_id', 'name', 'email', 'phone',
+        fields = ('id', 'worker_id', 'name', 'email', 'phone',
                   'department', 'position', 'shift',
                   'photo', 'photo_url', 'required_ppe', 'required_ppe_display',
                   'hire_date', 'employee_id', 'supervisor', 'supervisor_name',
                   'is_active', 'notes', 'compliance_rate',
                   'face_photo_valid',
-                  'created_at', 'updated_at']
+                  'created_at', 'updated_at')
         read_only_fields = ['id', 'created_at', 'updated_at', 'compliance_rate']
+        list_serializer_class = CachedListSerializer
 
-    def get_photo_url(self, obj):
-        """Get full photo URL."""
-        if obj.photo:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.photo.url)
-        return None
-
-    def get_supervisor_name(self, obj):
-        """Get supervisor name."""
-        if obj.supervisor:
-            return obj.supervisor.name
-        return None
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Load the related objects and only the columns this serializer reads."""
+        return queryset.select_related('supervisor').only(*model_field_sources(cls))
 
     def get_required_ppe_display(self, obj):
         """Get human-readable required PPE list."""
@@ -68,12 +194,19 @@ class WorkerCreateSerializer(serializers.ModelSerializer):
                   'photo', 'required_ppe',
                   'hire_date', 'employee_id', 'supervisor',
                   'is_active', 'notes']
+        # Replaces the auto-generated unique check, keeping the original message
+        extra_kwargs = {
+            'worker_id': {
+                'validators': [UniqueValidator(
+                    queryset=Worker.objects.all(),
+                    message="A worker with this ID already exists."
+                )]
+            }
+        }
 
-    def validate_worker_id(self, value):
-        """Validate worker_id is unique."""
-        if Worker.objects.filter(worker_id=value).exists():
-            raise serializers.ValidationError("A worker with this ID already exists.")
-        return value
+    def validate_required_ppe(self, value):
+        """Validate required PPE codes."""
+        return validate_ppe_codes(value)
 
 
 class WorkerUpdateSerializer(serializers.ModelSerializer):
@@ -84,10 +217,14 @@ class WorkerUpdateSerializer(serializers.ModelSerializer):
                   'shift', 'photo', 'required_ppe', 'hire_date',
                   'employee_id', 'supervisor', 'is_active', 'notes']
 
+    def validate_required_ppe(self, value):
+        """Validate required PPE codes."""
+        return validate_ppe_codes(value)
+
 
-class WorkerShiftSerializer(serializers.ModelSerializer):
+class WorkerShiftSerializer(SerializerCacheMixin, serializers.ModelSerializer):
     """Serializer for WorkerShift model."""
-    worker_name = serializers.SerializerMethodField()
+    worker_name = serializers.CharField(source='worker.name', read_only=True)
 
     class Meta:
         model = WorkerShift
@@ -95,32 +232,46 @@ class WorkerShiftSerializer(serializers.ModelSerializer):
                   'check_in', 'check_out', 'violations_count',
                   'alerts_triggered', 'notes', 'created_at']
         read_only_fields = ['id', 'created_at']
+        list_serializer_class = FastListSerializer
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Load the related objects this serializer reads."""
+        return queryset.select_related('worker')
+
 
-    def get_worker_name(self, obj):
-        """Get worker name."""
-        return obj.worker.name
+class WorkerDetailListSerializer(CachedListSerializer):
+    """Loads recent violations for all listed workers up front."""
+
+    def to_representation(self, data):
+        workers = list(data.all() if hasattr(data, 'all') else data)
+        self.context['recent_violations_map'] = recent_violations_map(
+            [worker.worker_id for worker in workers]
+        )
+        return super().to_representation(workers)
 
 
 class WorkerDetailSerializer(WorkerSerializer):
     """Detailed serializer with shift information."""
-    shifts = WorkerShiftSerializer(many=True, read_only=True)
+    shifts = WorkerShiftSerializer(source='recent_shifts_list', many=True, read_only=True)
     recent_violations = serializers.SerializerMethodField()
 
     class Meta(WorkerSerializer.Meta):
-        fields = WorkerSerializer.Meta.fields + ['shifts', 'recent_violations']
+        fields = WorkerSerializer.Meta.fields + ('shifts', 'recent_violations')
+        list_serializer_class = WorkerDetailListSerializer
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Load the related objects this serializer reads, up to the latest shifts."""
+        return super().setup_eager_loading(queryset).prefetch_related(Prefetch(
+            'shifts',
+            queryset=WorkerShift.objects.order_by('-date', 'shift_type')[:RECENT_SHIFTS_LIMIT],
+            to_attr='recent_shifts_list'
+        ))
 
     def get_recent_violations(self, obj):
         """Get recent violations for this worker."""
-        from detection.models import ViolationRecord
-        violations = ViolationRecord.objects.filter(
-            worker_id=obj.worker_id
-        ).order_by('-timestamp')[:5]
-        return [
-            {
-                'violation_id': v.violation_id,
-                'timestamp': v.timestamp,
-                'missing_ppe': v.missing_ppe,
-                'status': v.status
-            }
-            for v in violations
-        ]
+        violations_map = self.context.get('recent_violations_map')
+        if violations_map is None:
+            violations_map = recent_violations_map([obj.worker_id])
+        return violations_map.get(obj.worker_id, [])
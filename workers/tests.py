@@ -1,3 +1,59 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from authentication.models import User
+from .models import Worker
+
+
+class WorkerQueryColumnTests(TestCase):
+    """Worker endpoints must not fetch the stored face encodings."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='viewer', password='secret')
+        supervisor = Worker.objects.create(
+            worker_id='SUP-1', name='Supervisor', face_encoding_bin=b'\x00' * 512
+        )
+        cls.worker = Worker.objects.create(
+            worker_id='WRK-1', name='Worker', supervisor=supervisor,
+            face_encoding_bin=b'\x00' * 512
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertNoFaceEncodingColumns(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        for query in queries.captured_queries:
+            self.assertNotIn('face_encoding', query['sql'])
+        return response.json()
+
+    def test_list_skips_face_encodings(self):
+        data = self.assertNoFaceEncodingColumns('/api/workers/')
+        names = {row['worker_id']: row['supervisor_name'] for row in data['results']}
+        self.assertEqual(names, {'SUP-1': None, 'WRK-1': 'Supervisor'})
+
+    def test_detail_skips_face_encodings(self):
+        data = self.assertNoFaceEncodingColumns(f'/api/workers/{self.worker.id}/')
+        self.assertEqual(data['supervisor_name'], 'Supervisor')
+
+
+class RequiredPPEDisplayTests(TestCase):
+
+    def test_display_names(self):
+        worker = Worker(required_ppe=['hardHat', 'vest', 'unknown'])
+        self.assertEqual(
+            worker.get_required_ppe_display(), ['Hard Hat', 'Safety Vest', 'unknown']
+        )
+
+    def test_unhashable_entries_do_not_raise(self):
+        worker = Worker(required_ppe=['hardHat', ['vest'], {'type': 'gloves'}])
+        self.assertEqual(
+            worker.get_required_ppe_display(),
+            ['Hard Hat', "['vest']", "{'type': 'gloves'}"]
+        )
@@ -21,17 +21,29 @@ from .serializers import (
 logger = logging.getLogger(__name__)
 
 
-class WorkerListCreateView(generics.ListCreateAPIView):
+class EagerLoadingMixin:
+    """Apply the serializer's setup_eager_loading() to the view queryset."""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        setup_eager_loading = getattr(self.get_serializer_class(), 'setup_eager_loading', None)
+        if setup_eager_loading:
+            queryset = setup_eager_loading(queryset)
+        return queryset
+
+
+class WorkerListCreateView(EagerLoadingMixin, generics.ListCreateAPIView):
     """
     API endpoint for listing and creating workers.
 
     GET /api/workers/ - List all workers
     POST /api/workers/ - Create a new worker
     """
+    queryset = Worker.objects.all()
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        queryset = Worker.objects.all()
+        queryset = super().get_queryset()
 
         # Filter by department
         department = self.request.query_params.get('department')
@@ -64,7 +76,7 @@ class WorkerListCreateView(generics.ListCreateAPIView):
         serializer.save(created_by=self.request.user)
 
 
-class WorkerDetailView(generics.RetrieveUpdateDestroyAPIView):
+class WorkerDetailView(EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     API endpoint for worker details.
 
@@ -85,7 +97,7 @@ class WorkerDetailView(generics.RetrieveUpdateDestroyAPIView):
         return WorkerSerializer
 
 
-class WorkerByWorkerIdView(generics.RetrieveAPIView):
+class WorkerByWorkerIdView(EagerLoadingMixin, generics.RetrieveAPIView):
     """
     API endpoint for getting worker by worker_id.
 
@@ -252,7 +264,7 @@ def add_worker_with_photo(request):
             shift=request.data.get('shift', 'day'),
             photo=photo,
             required_ppe=request.data.get('required_ppe', []),
-            face_encoding=face_encoding.tolist(),  # Convert numpy to list
+            face_encoding_bin=np.asarray(face_encoding, dtype=np.float32).tobytes(),
             face_photo_valid=True,
             created_by=request.user if request.user.is_authenticated else None
         )
@@ -286,7 +298,6 @@ def retrain_face_model(request):
     POST /api/workers/retrain-face-model/
     """
     from detection.services.face_recognition import FaceRecognitionService
-    import numpy as np
 
     try:
         # Load all workers with valid face encodings
@@ -298,11 +309,12 @@ def retrain_face_model(request):
             }, status=status.HTTP_400_BAD_REQUEST)
 
         workers_data = []
-        for worker in workers:
-            if worker.face_encoding:
+        for worker in workers.only('worker_id', 'face_encoding_bin'):
+            encoding = worker.face_encoding_array
+            if encoding is not None:
                 workers_data.append({
                     'worker_id': worker.worker_id,
-                    'face_encoding': np.array(worker.face_encoding)
+                    'face_encoding': encoding
                 })
 
         if not workers_data: